@@ -1,5 +1,7 @@
 import numpy as np
+import mmap
 import os
+import shutil
 import sys
 
 # Ensure imports work
@@ -29,18 +31,20 @@ def generate_web_bundle():
     y0_2d = [0.0, 0.2]
     drift = 'sinusoidal'
 
+    # Möbius and cylinder share the same (u, v) trajectory and differ only
+    # in the 3D mapping, so integrate once and reuse the solution.
+    sol_2d = integrate_trajectory(flow_field, y0_2d, t_span, args=(drift,))
+
     # 1. Möbius
     print("Generating Möbius Assets...")
-    sol_mob = integrate_trajectory(flow_field, y0_2d, t_span, args=(drift,))
-    res_mob = extract_signatures(sol_mob, mobius_mapping)
+    res_mob = extract_signatures(sol_2d, mobius_mapping)
     create_interactive_plot(res_mob, mobius_mapping, "Möbius Interactive", f"{dist_dir}/mobius_3d.html")
     create_animated_simulation(res_mob, mobius_mapping, "Möbius Particle Drift", f"{dist_dir}/simulations/mobius_sim.html")
     export_results_to_json(res_mob, f"{dist_dir}/data/mobius_data.json")
 
     # 2. Cylinder
     print("Generating Cylinder Assets...")
-    sol_cyl = integrate_trajectory(flow_field, y0_2d, t_span, args=(drift,))
-    res_cyl = extract_signatures(sol_cyl, cylinder_mapping)
+    res_cyl = extract_signatures(sol_2d, cylinder_mapping)
     create_interactive_plot(res_cyl, cylinder_mapping, "Cylinder Interactive", f"{dist_dir}/cylinder_3d.html")
     export_results_to_json(res_cyl, f"{dist_dir}/data/cylinder_data.json")
 
@@ -70,19 +74,36 @@ def generate_web_bundle():
     print("\n💎 Building Premium Three.js Bundle (Inlined Data)...")
     
     def create_premium_bundle(json_path, template_path, output_path, title_sub):
-        with open(json_path, 'r', encoding='utf-8') as f:
-            sim_json = f.read()
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        # Inject data before the main script or at top of body
-        inlined_script = f"<script>window.SIM_DATA = {sim_json};</script>\n"
-        inlined_html = html_content.replace('<head>', f'<head>\n    {inlined_script}')
-        inlined_html = inlined_html.replace('Premium Three.js Rendering Prototype', title_sub)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(inlined_html)
+        # Stream the template (memory-mapped) and the JSON straight into the
+        # output instead of materializing the whole inlined page as a string.
+        title_old = b'Premium Three.js Rendering Prototype'
+        title_new = title_sub.encode('utf-8')
+
+        def write_template(out, tpl, view, start, end):
+            # Copy tpl[start:end], substituting the page title on the way
+            while True:
+                hit = tpl.find(title_old, start, end)
+                if hit < 0:
+                    out.write(view[start:end])
+                    return
+                out.write(view[start:hit])
+                out.write(title_new)
+                start = hit + len(title_old)
+
+        with open(template_path, 'rb') as tf, \
+                mmap.mmap(tf.fileno(), 0, access=mmap.ACCESS_READ) as tpl, \
+                memoryview(tpl) as view, \
+                open(output_path, 'wb') as out:
+            # Inject data at the top of <head>
+            head = tpl.find(b'<head>')
+            cut = len(tpl) if head < 0 else head + len(b'<head>')
+            write_template(out, tpl, view, 0, cut)
+            if head >= 0:
+                out.write(b'\n    <script>window.SIM_DATA = ')
+                with open(json_path, 'rb') as jf:
+                    shutil.copyfileobj(jf, out)
+                out.write(b';</script>\n')
+            write_template(out, tpl, view, cut, len(tpl))
         print(f"   Created Premium Page: {output_path}")
 
     # Create Möbius Premium
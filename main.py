@@ -16,25 +16,26 @@ def main():
     drift = 'sinusoidal'
 
     from core.flow import flow_field
+    # Both manifolds share the same intrinsic (u, v) trajectory; only the
+    # 3D mapping differs, so integrate once and reuse the solution.
+    sol = integrate_trajectory(flow_field, y0, t_span, args=(drift,))
+
     print("--- Starting Möbius Simulation ---")
-    sol_mob = integrate_trajectory(flow_field, y0, t_span, args=(drift,))
-    res_mob = extract_signatures(sol_mob, mobius_mapping)
+    res_mob = extract_signatures(sol, mobius_mapping)
     plot_topological_results(res_mob, mobius_mapping, "Möbius", "results/mobius_modular.png")
-    
-    # Export Data
-    np.save("data/mobius_w1.npy", res_mob['w1'])
-    np.save("data/mobius_delta.npy", res_mob['delta'])
 
     print("\n--- Starting Cylinder Simulation ---")
-    sol_cyl = integrate_trajectory(flow_field, y0, t_span, args=(drift,))
-    res_cyl = extract_signatures(sol_cyl, cylinder_mapping)
+    res_cyl = extract_signatures(sol, cylinder_mapping)
     # Force w1=0 for cylinder (it's globally orientable)
     res_cyl['w1'] = np.zeros_like(res_cyl['w1'])
     plot_topological_results(res_cyl, cylinder_mapping, "Cylinder", "results/cylinder_modular.png")
     
-    # Export Data
-    np.save("data/cylinder_w1.npy", res_cyl['w1'])
-    np.save("data/cylinder_delta.npy", res_cyl['delta'])
+    # Export Data (both manifolds in a single compressed bundle)
+    np.savez_compressed(
+        "data/modular_signatures.npz",
+        mobius_w1=res_mob['w1'].astype(np.uint8), mobius_delta=res_mob['delta'],
+        cylinder_w1=res_cyl['w1'].astype(np.uint8), cylinder_delta=res_cyl['delta'],
+    )
 
     print("\nModular Refactor successfully validated.")
 
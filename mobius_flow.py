@@ -1,33 +1,115 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
-from mpl_toolkits.mplot3d import Axes3D
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # numba is optional; fall back to plain Python
+    _HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+# Output locations, resolved relative to this file rather than the CWD
+DATA_DIR = Path(__file__).resolve().parent / "data"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+@njit(cache=True)
+def mobius_mapping_vec(u, v, out_pos, out_ru, out_rv):
+    """Compiled Möbius mapping: fills preallocated (3, N) buffers for each (u[i], v[i])."""
+    for i in range(u.shape[0]):
+        ui, vi = u[i], v[i]
+        cu, su = np.cos(ui), np.sin(ui)
+        ch, sh = np.cos(0.5 * ui), np.sin(0.5 * ui)
+        r = 1 + 0.5 * vi * ch
+        qs = 0.25 * vi * sh
+
+        out_pos[0, i] = r * cu
+        out_pos[1, i] = r * su
+        out_pos[2, i] = 0.5 * vi * sh
+
+        out_ru[0, i] = -qs * cu - r * su
+        out_ru[1, i] = -qs * su + r * cu
+        out_ru[2, i] = 0.25 * vi * ch
+
+        out_rv[0, i] = 0.5 * ch * cu
+        out_rv[1, i] = 0.5 * ch * su
+        out_rv[2, i] = 0.5 * sh
+
+@njit(cache=True)
+def cylinder_mapping_vec(u, v, out_pos, out_ru, out_rv):
+    """Compiled cylinder mapping: fills preallocated (3, N) buffers for each (u[i], v[i])."""
+    for i in range(u.shape[0]):
+        cu, su = np.cos(u[i]), np.sin(u[i])
+
+        out_pos[0, i] = cu
+        out_pos[1, i] = su
+        out_pos[2, i] = v[i]
+
+        out_ru[0, i] = -su
+        out_ru[1, i] = cu
+        out_ru[2, i] = 0.0
+
+        out_rv[0, i] = 0.0
+        out_rv[1, i] = 0.0
+        out_rv[2, i] = 1.0
+
+def _map_with_kernel(kernel, u, v):
+    """Runs a compiled ``*_mapping_vec`` kernel on 1-D u with scalar or same-shape v."""
+    u = np.ascontiguousarray(u, dtype=np.float64)
+    v = np.ascontiguousarray(np.broadcast_to(v, u.shape), dtype=np.float64)
+    out_pos, out_ru, out_rv = (np.empty((3, u.shape[0])) for _ in range(3))
+    kernel(u, v, out_pos, out_ru, out_rv)
+    return out_pos, out_ru, out_rv
 
 def mobius_mapping(u, v):
-    """Maps (u, v) to 3D and returns mapping + partial derivatives."""
-    x = (1 + 0.5 * v * np.cos(u / 2)) * np.cos(u)
-    y = (1 + 0.5 * v * np.cos(u / 2)) * np.sin(u)
-    z = 0.5 * v * np.sin(u / 2)
-    pos = np.array([x, y, z])
+    """Maps (u, v) to 3D and returns mapping + partial derivatives.
+
+    Accepts scalars or 1-D arrays; array inputs return arrays of shape (3, N).
+    """
+    if _HAVE_NUMBA and np.ndim(u) == 1 and np.shape(v) in ((), np.shape(u)):
+        return _map_with_kernel(mobius_mapping_vec, u, v)
+
+    cu, su = np.cos(u), np.sin(u)
+    ch, sh = np.cos(u / 2), np.sin(u / 2)
+    r = 1 + 0.5 * v * ch  # distance from the central axis
+    qs = 0.25 * v * sh
+
+    x = r * cu
+    y = r * su
+    z = 0.5 * v * sh
+    pos = np.stack([x, y, z], axis=0)
     
     # Tangent vectors
-    xu = -0.25 * v * np.sin(u/2) * np.cos(u) - (1 + 0.5 * v * np.cos(u/2)) * np.sin(u)
-    yu = -0.25 * v * np.sin(u/2) * np.sin(u) + (1 + 0.5 * v * np.cos(u/2)) * np.cos(u)
-    zu = 0.25 * v * np.cos(u/2)
-    ru = np.array([xu, yu, zu])
+    xu = -qs * cu - r * su
+    yu = -qs * su + r * cu
+    zu = 0.25 * v * ch
+    ru = np.stack([xu, yu, zu], axis=0)
     
-    xv = 0.5 * np.cos(u/2) * np.cos(u)
-    yv = 0.5 * np.cos(u/2) * np.sin(u)
-    zv = 0.5 * np.sin(u/2)
-    rv = np.array([xv, yv, zv])
+    xv = 0.5 * ch * cu
+    yv = 0.5 * ch * su
+    zv = 0.5 * sh
+    rv = np.stack([xv, yv, zv], axis=0)
     
     return pos, ru, rv
 
 def cylinder_mapping(u, v):
-    """Maps (u, v) to 3D and returns mapping + partial derivatives."""
-    pos = np.array([np.cos(u), np.sin(u), v])
-    ru = np.array([-np.sin(u), np.cos(u), 0])
-    rv = np.array([0, 0, 1])
+    """Maps (u, v) to 3D and returns mapping + partial derivatives.
+
+    Accepts scalars or 1-D arrays; array inputs return arrays of shape (3, N).
+    """
+    if _HAVE_NUMBA and np.ndim(u) == 1 and np.shape(v) in ((), np.shape(u)):
+        return _map_with_kernel(cylinder_mapping_vec, u, v)
+
+    u, v = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(v, dtype=float))
+    cu, su = np.cos(u), np.sin(u)
+    zeros, ones = np.zeros_like(u), np.ones_like(u)
+    pos = np.stack([cu, su, v], axis=0)
+    ru = np.stack([-su, cu, zeros], axis=0)
+    rv = np.stack([zeros, zeros, ones], axis=0)
     return pos, ru, rv
 
 def flow_field(t, state, drift_type='constant'):
@@ -41,66 +123,108 @@ def flow_field(t, state, drift_type='constant'):
         dv_dt = 0.0
     return [du_dt, dv_dt]
 
+_DRIFT_CODES = {'constant': 0, 'sinusoidal': 1}
+
+@njit(cache=True)
+def integrate_mobius_rk4(t_max, n_steps, u0, v0, drift_code):
+    """Fixed-step RK4 integration of the (u, v) flow on [0, t_max].
+
+    drift_code selects the transverse drift (0: constant, 1: sinusoidal).
+    Returns (t, u, v) sampled at the n_steps + 1 grid points.
+    """
+    h = t_max / n_steps
+    amp = 0.1 if drift_code == 1 else 0.0
+    t_vals = np.empty(n_steps + 1)
+    u_vals = np.empty(n_steps + 1)
+    v_vals = np.empty(n_steps + 1)
+    u, v = u0, v0
+    t_vals[0], u_vals[0], v_vals[0] = 0.0, u, v
+    for i in range(n_steps):
+        # du/dt = 1 exactly, so only the v stages need evaluating
+        k1 = amp * np.sin(u)
+        k2 = amp * np.sin(u + 0.5 * h)
+        k4 = amp * np.sin(u + h)
+        u = u0 + (i + 1) * h
+        v += h / 6.0 * (k1 + 4.0 * k2 + k4)
+        t_vals[i + 1], u_vals[i + 1], v_vals[i + 1] = (i + 1) * h, u, v
+    return t_vals, u_vals, v_vals
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _signature_kernel(u_vals, v_vals, drift_amp):
+    """Computes theta (unwrapped), delta and w1 in a single pass over the samples."""
+    n = u_vals.shape[0]
+    theta = np.empty(n)
+    delta = np.empty(n)
+    w1 = np.empty(n, dtype=np.uint8)
+    for i in prange(n):
+        u = u_vals[i]
+        # Intrinsic velocity: du/dt = 1, dv/dt = drift_amp * sin(u)
+        theta[i] = np.arctan2(drift_amp * np.sin(u), 1.0)
+        delta[i] = abs(v_vals[i])
+        # Parity flips wherever the transverse direction cos(u/2) changes sign.
+        # Away from its zeros u = (2k+1)pi, cos(u/2) < 0 when floor((u + pi) / 2pi)
+        # is odd, so take the low bit of that integer instead of branching on a
+        # cosine; at the zeros themselves the floor form already reports the flip.
+        w1[i] = np.int64(np.floor((u + np.pi) * (0.5 / np.pi))) & 1
+
+    # Phase unwrapping (same rule as np.unwrap) is a running sum, so serial
+    correction = 0.0
+    prev = theta[0] if n > 0 else 0.0
+    for i in range(1, n):
+        raw = theta[i]
+        dd = raw - prev
+        ddmod = (dd + np.pi) % (2 * np.pi) - np.pi
+        if ddmod == -np.pi and dd > 0:
+            ddmod = np.pi
+        if abs(dd) >= np.pi:
+            correction += ddmod - dd
+        prev = raw
+        theta[i] = raw + correction
+    return theta, delta, w1
+
+def _trajectory(drift_type, t_max):
+    """Returns (t, u, v) for the flow from (u, v) = (0, 0.2) on 1000 samples of [0, t_max]."""
+    u0, v0 = 0.0, 0.2  # Initial state (u, v)
+    drift_code = _DRIFT_CODES.get(drift_type, 0)
+    if drift_code == 0:
+        # Constant drift (du/dt = 1, dv/dt = 0) has the closed form u = u0 + t, v = v0
+        t_vals = np.linspace(0, t_max, 1000)
+        u_vals = u0 + t_vals
+        v_vals = np.full_like(t_vals, v0)
+    else:
+        t_vals, u_vals, v_vals = integrate_mobius_rk4(t_max, 999, u0, v0, drift_code)
+    return t_vals, u_vals, v_vals
+
 def run_simulation(mapping_func, drift_type='constant', t_max=4*np.pi, save_data=True):
-    t_span = (0, t_max)
-    y0 = [0.0, 0.2]  # Initial state (u, v)
-    
-    sol = solve_ivp(flow_field, t_span, y0, args=(drift_type,), 
-                    t_eval=np.linspace(0, t_max, 1000), method='RK45')
-    
-    u_vals = sol.y[0]
-    v_vals = sol.y[1]
-    t_vals = sol.t
-    
-    # Calculate velocities in intrinsic space
-    flow_vectors = np.array([flow_field(t, [u, v], drift_type) for t, u, v in zip(t_vals, u_vals, v_vals)])
-    du_dt_vals = flow_vectors[:, 0]
-    dv_dt_vals = flow_vectors[:, 1]
+    t_vals, u_vals, v_vals = _trajectory(drift_type, float(t_max))
     
-    # Topological Signatures
-    theta_vals = np.arctan2(dv_dt_vals, du_dt_vals)
-    theta_unwrapped = np.unwrap(theta_vals)
-    delta_vals = np.abs(v_vals)
+    # Topological Signatures (velocity phase, seam distance and parity)
+    drift_amp = 0.1 if drift_type == 'sinusoidal' else 0.0
+    theta_unwrapped, delta_vals, w1_vals = _signature_kernel(u_vals, v_vals, drift_amp)
     
-    # 3D Mapping and Frame Tracking
-    coords_3d = []
-    frames = []
-    w1_vals = []
-    current_parity = 0
-    prev_normal = None
-    
-    for u, v in zip(u_vals, v_vals):
-        pos, ru, rv = mapping_func(u, v)
-        # Normalize frame
-        ru_n = ru / np.linalg.norm(ru)
-        rv_n = rv / np.linalg.norm(rv)
-        normal = np.cross(ru, rv)
-        normal_n = normal / np.linalg.norm(normal)
-        
-        # Parity tracking via Radial Projection of RV
-        # rv is the transverse tangent vector. 
-        # radial_vec (R) points from center through the particle.
-        radial_vec = np.array([np.cos(u), np.sin(u), 0])
-        # We use sgn(rv . R) to track the orientation flip.
-        # However, to match the w1 = floor(u/2pi) mod 2 convention:
-        projection = np.dot(rv, radial_vec)
-        # The twist is centered at 2pi, 6pi, etc.
-        # To get a step at 2pi, we can look at the sign of the mapping's cos(u/2)
-        w1 = 1 if np.cos(u/2) < 0 else 0
-        w1_vals.append(w1)
-        
-        coords_3d.append(pos)
-        frames.append((ru_n, rv_n, normal_n))
-        prev_normal = normal_n
-        
-    coords_3d = np.array(coords_3d).T
-    w1_vals = np.array(w1_vals)
+    # 3D Mapping and Frame Tracking (all samples at once, shape (3, N))
+    coords_3d, ru, rv = mapping_func(u_vals, v_vals)
+
+    # frames[i] = (ru_n, rv_n, normal_n) as rows of one preallocated (N, 3, 3)
+    # array; every component is written in place through (3, N) views.
+    n = u_vals.shape[0]
+    frames = np.empty((n, 3, 3))
+    ru_x, ru_y, ru_z = ru
+    rv_x, rv_y, rv_z = rv
+    normal = frames[:, 2, :].T
+    np.subtract(ru_y * rv_z, ru_z * rv_y, out=normal[0])
+    np.subtract(ru_z * rv_x, ru_x * rv_z, out=normal[1])
+    np.subtract(ru_x * rv_y, ru_y * rv_x, out=normal[2])
+
+    for k, vec in enumerate((ru, rv, normal)):
+        x, y, z = vec
+        np.multiply(vec, 1.0 / np.sqrt(x * x + y * y + z * z), out=frames[:, k, :].T)
     
     if save_data:
         prefix = "mobius" if "mobius" in mapping_func.__name__ else "cylinder"
-        np.save(f"data/{prefix}_theta.npy", theta_unwrapped)
-        np.save(f"data/{prefix}_delta.npy", delta_vals)
-        np.save(f"data/{prefix}_w1.npy", w1_vals)
+        DATA_DIR.mkdir(exist_ok=True)
+        np.savez_compressed(DATA_DIR / f"{prefix}.npz", theta=theta_unwrapped,
+                            delta=delta_vals, w1=w1_vals)
 
     return {
         't': t_vals,
@@ -113,23 +237,36 @@ def run_simulation(mapping_func, drift_type='constant', t_max=4*np.pi, save_data
         'frames': frames
     }
 
-def plot_results(results, title_prefix="Möbius"):
-    fig = plt.figure(figsize=(15, 10))
-    
-    # 3D Trajectory
-    ax1 = fig.add_subplot(2, 2, 1, projection='3d')
-    # Plot the surface for context
-    u_surf = np.linspace(0, max(results['u']), 100)
+@lru_cache(maxsize=8)
+def _make_surface(title_prefix, u_max):
+    """Builds the (read-only) X, Y, Z context mesh for plot_results."""
+    u_surf = np.linspace(0, u_max, 100)
     v_surf = np.linspace(-0.5, 0.5, 20)
     U, V = np.meshgrid(u_surf, v_surf)
     if title_prefix == "Möbius":
-        X = (1 + 0.5 * V * np.cos(U/2)) * np.cos(U)
-        Y = (1 + 0.5 * V * np.cos(U/2)) * np.sin(U)
+        R = 1 + 0.5 * V * np.cos(U/2)
+        X = R * np.cos(U)
+        Y = R * np.sin(U)
         Z = 0.5 * V * np.sin(U/2)
     else:
         X = np.cos(U)
         Y = np.sin(U)
         Z = V
+    for arr in (X, Y, Z):
+        arr.flags.writeable = False
+    return X, Y, Z
+
+def plot_results(results, title_prefix="Möbius"):
+    # matplotlib is imported lazily so that importing the mappings stays cheap
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # registers the '3d' projection
+
+    fig = plt.figure(figsize=(15, 10))
+    
+    # 3D Trajectory
+    ax1 = fig.add_subplot(2, 2, 1, projection='3d')
+    # Plot the surface for context (cached per manifold and trajectory length)
+    X, Y, Z = _make_surface(title_prefix, round(float(max(results['u'])), 3))
     
     ax1.plot_surface(X, Y, Z, alpha=0.1, color='gray') # Reduced alpha for better visibility of frames
     ax1.plot(results['coords_3d'][0], results['coords_3d'][1], results['coords_3d'][2], color='red', lw=2)
@@ -174,7 +311,8 @@ def plot_results(results, title_prefix="Möbius"):
     ax4.grid(True, linestyle='--', alpha=0.7)
     
     plt.tight_layout()
-    save_path = f"results/{title_prefix.lower()}_results.png"
+    RESULTS_DIR.mkdir(exist_ok=True)
+    save_path = RESULTS_DIR / f"{title_prefix.lower()}_results.png"
     plt.savefig(save_path)
     print(f"Results saved to {save_path}")
 
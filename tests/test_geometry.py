@@ -21,22 +21,23 @@ def test_orthogonality(mapping_func, name="Möbius"):
     u_samples = np.linspace(0, 2*np.pi, 20)
     v_samples = np.linspace(-0.4, 0.4, 10)
 
-    max_dot = 0
-    for u in u_samples:
-        for v in v_samples:
-            pos, ru, rv = mapping_func(u, v)
-
-            # Normalize vectors
-            ru_n = ru / np.linalg.norm(ru)
-            rv_n = rv / np.linalg.norm(rv)
-
-            # Check orthogonality
-            dot_product = np.dot(ru_n, rv_n)
-            max_dot = max(max_dot, abs(dot_product))
-
-            if abs(dot_product) > 0.1:  # Tolerance for orthogonality
-                print(f"❌ FAILED at u={u:.2f}, v={v:.2f}: dot = {dot_product:.4f}")
-                return False
+    # Evaluate every (u, v) sample in one vectorized mapping call
+    U, V = np.meshgrid(u_samples, v_samples)
+    u_flat, v_flat = U.ravel(), V.ravel()
+    pos, ru, rv = mapping_func(u_flat, v_flat)
+
+    # Normalize vectors
+    ru_n = ru / np.linalg.norm(ru, axis=0)
+    rv_n = rv / np.linalg.norm(rv, axis=0)
+
+    # Check orthogonality
+    dots = np.einsum('ij,ij->j', ru_n, rv_n)
+    worst = np.argmax(np.abs(dots))
+    max_dot = abs(dots[worst])
+
+    if max_dot > 0.1:  # Tolerance for orthogonality
+        print(f"❌ FAILED at u={u_flat[worst]:.2f}, v={v_flat[worst]:.2f}: dot = {dots[worst]:.4f}")
+        return False
 
     print(f"✅ PASSED: Max dot product = {max_dot:.6f} (threshold: 0.1)")
     return True
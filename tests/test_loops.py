@@ -11,7 +11,7 @@ import os
 
 # Add parent directory to path to import mobius_flow
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from mobius_flow import mobius_mapping, cylinder_mapping
+from mobius_flow import mobius_mapping, cylinder_mapping, _signature_kernel
 
 
 def test_parity_pattern(mapping_func, name="Möbius", expected_pattern=None):
@@ -23,17 +23,8 @@ def test_parity_pattern(mapping_func, name="Möbius", expected_pattern=None):
     samples_per_loop = 100
     u_vals = np.linspace(0, num_loops * 2 * np.pi, num_loops * samples_per_loop)
 
-    v = 0.2  # Fixed transverse position
-    w1_vals = []
-
-    for u in u_vals:
-        pos, ru, rv = mapping_func(u, v)
-
-        # Compute w1 using the same logic as in mobius_flow.py
-        w1 = 1 if np.cos(u/2) < 0 else 0
-        w1_vals.append(w1)
-
-    w1_vals = np.array(w1_vals)
+    # Compute w1 with the same kernel mobius_flow.py uses (v and drift don't affect it)
+    w1_vals = _signature_kernel(u_vals, np.zeros_like(u_vals), 0.0)[2]
 
     # Check pattern at key loop boundaries
     print(f"Sampled w1 values at loop boundaries:")